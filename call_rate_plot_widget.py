@@ -31,13 +31,14 @@ class CallRatePlotWidget(QWidget):
         self._rate_plot_item = self._rate_plot_widget.getPlotItem()
         self._rate_plot_item.setTitle('RNG Call Rate')
         self._rate_plot_item.setLabels(left='Call Rate [Calls/sec]', bottom='Time [s]')
-        self._rate_plot = self._rate_plot_item.plot(antialias=False)
+        # NaN samples mark connection gaps, connect='finite' breaks the line there
+        self._rate_plot = self._rate_plot_item.plot(antialias=False, connect='finite')
         self._main_layout.addWidget(self._rate_plot_widget)
         self._total_plot_widget = PlotWidget()
         self._total_plot_item = self._total_plot_widget.getPlotItem()
         self._total_plot_item.setTitle('Total RNG Calls')
         self._total_plot_item.setLabels(left='Total RNG Calls', bottom='Time [s]')
-        self._total_plot = self._total_plot_item.plot()
+        self._total_plot = self._total_plot_item.plot(connect='finite')
         self._main_layout.addWidget(self._total_plot_widget)
         self._buffer = CircularFloatBuffer(3, maxlen=10000)
         self._start_time = time.perf_counter()
@@ -59,6 +60,10 @@ class CallRatePlotWidget(QWidget):
         self._rate_plot.setData(time_base, avg_data)
         self._total_plot.setData(time_base, total_data)
 
+    def append_gap(self, gap_duration: float):
+        gap_start_time = time.perf_counter() - self._start_time - gap_duration
+        self._buffer.append([gap_start_time, np.nan, np.nan])
+
     def _handle_backlog_time_changed(self, new_text: str):
         if len(new_text) == 0:
             self._backlog_length = 0
@@ -0,0 +1,89 @@
+from typing import Callable, Optional
+from tcp_gecko_client import TCPGeckoClient
+import time
+
+
+class TCPGeckoConnectionSupervisor:
+    INITIAL_BACKOFF = 0.25
+    MAX_BACKOFF = 8.0
+    BACKOFF_FACTOR = 2.0
+    # granularity of backoff sleeps so a stop request is honored promptly
+    SLEEP_SLICE = 0.05
+
+    def __init__(self,
+                 client: TCPGeckoClient,
+                 status_listener: Callable[[str], None] = None):
+        """
+        Owns the lifetime of a TCPGeckoClient connection and re-establishes it
+        with exponential backoff when the link is lost.
+        """
+        self._client = client
+        self._status_listener = status_listener
+        self._ip_address = None  # type: Optional[str]
+        # reconnect attempts and backoff persist across reconnect calls until a read succeeds
+        self._attempt = 0
+        self._backoff = self.INITIAL_BACKOFF
+        self._outage_count = 0
+        self._total_outage_time = 0.0
+
+    @property
+    def outage_count(self) -> int:
+        return self._outage_count
+
+    @property
+    def total_outage_time(self) -> float:
+        return self._total_outage_time
+
+    def _notify(self, message: str):
+        if self._status_listener is not None:
+            self._status_listener(message)
+
+    def connect(self, ip_address: str) -> bool:
+        self._ip_address = ip_address
+        self._attempt = 0
+        self._backoff = self.INITIAL_BACKOFF
+        self._outage_count = 0
+        self._total_outage_time = 0.0
+        return self._client.connect(ip_address)
+
+    def disconnect(self):
+        self._client.disconnect()
+
+    def reconnect(self, should_continue: Callable[[], bool]) -> bool:
+        """
+        Drop the current socket and reconnect to the last address until a
+        connection succeeds or should_continue returns False. Every attempt after
+        the first of an outage waits for an exponentially growing backoff, even when
+        an earlier call connected but reads on that connection failed.
+
+        :param should_continue: polled between attempts, stop retrying when it returns False
+        :type should_continue: Callable[[], bool]
+        :return: True if the connection was re-established
+        :rtype: bool
+        """
+        if self._ip_address is None:
+            return False
+        self._client.disconnect()
+        while should_continue():
+            if self._attempt > 0:
+                retry_time = time.perf_counter() + self._backoff
+                while should_continue() and time.perf_counter() < retry_time:
+                    time.sleep(self.SLEEP_SLICE)
+                if not should_continue():
+                    break
+                self._backoff = min(self._backoff * self.BACKOFF_FACTOR, self.MAX_BACKOFF)
+            self._attempt += 1
+            self._notify('Lost connection to TCPGecko, reconnecting (attempt {})...'.format(self._attempt))
+            if self._client.connect(self._ip_address):
+                return True
+        return False
+
+    def record_outage(self, duration: float):
+        """
+        Account for an outage that ended with a successful read, this also resets
+        the reconnect backoff.
+        """
+        self._attempt = 0
+        self._backoff = self.INITIAL_BACKOFF
+        self._outage_count += 1
+        self._total_outage_time += duration
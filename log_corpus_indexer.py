@@ -0,0 +1,271 @@
+from typing import List, Optional, Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import datetime
+import sqlite3
+import glob
+import sys
+import csv
+import os
+
+LOG_FILE_PATTERN = 'WWRNG_log_*.csv'
+DEFAULT_INDEX_FILE_NAME = 'WWRNG_log_index.sqlite'
+# bump whenever the sessions table layout changes, the index is then rebuilt from the logs
+INDEX_SCHEMA_VERSION = 2
+
+
+class SessionSummary:
+    FIELDS = (
+        'path', 'mtime', 'size', 'start_timestamp', 'sample_count', 'duration',
+        'total_steps', 'peak_rate', 'peak_rate_timestamp', 'gap_count', 'gap_duration'
+    )
+
+    def __init__(self, path: str, mtime: float, size: int, start_timestamp: Optional[float] = None,
+                 sample_count: int = 0, duration: float = 0.0, total_steps: int = 0,
+                 peak_rate: float = 0.0, peak_rate_timestamp: Optional[float] = None,
+                 gap_count: int = 0, gap_duration: float = 0.0):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.start_timestamp = start_timestamp
+        self.sample_count = sample_count
+        self.duration = duration
+        self.total_steps = total_steps
+        self.peak_rate = peak_rate
+        self.peak_rate_timestamp = peak_rate_timestamp
+        self.gap_count = gap_count
+        self.gap_duration = gap_duration
+
+    @property
+    def calls_per_hour(self) -> float:
+        if self.duration <= 0:
+            return 0.0
+        return self.total_steps / self.duration * 3600
+
+    def as_row(self) -> Tuple:
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+
+def parse_session_log(path: str) -> SessionSummary:
+    """
+    Summarize a single tracker log file. The first sample of every session is
+    measured against the tracker's seed state rather than a previous reading,
+    so its step count and time delta are skipped. Logs written before connection
+    gap accounting existed have no Gap column and are treated as gap free. Samples
+    flagged in the Resync column were searched from the seed state as well and are
+    skipped the same way.
+
+    :param path: path of the WWRNG_log_*.csv file to parse
+    :type path: str
+    :return: the summary record for the session
+    :rtype: SessionSummary
+    """
+    stat_result = os.stat(path)
+    summary = SessionSummary(path, stat_result.st_mtime, stat_result.st_size)
+    first_runtime = None
+    last_runtime = None
+    resync_time = 0.0
+    with open(path, 'r', newline='') as log_file:
+        for row in csv.DictReader(log_file):
+            try:
+                timestamp = float(row['Timestamp'])
+                runtime = float(row['Runtime'])
+                time_delta = float(row['Time Delta'])
+                steps = int(row['Steps'])
+                gap = float(row.get('Gap') or 0.0)
+                resynced = row.get('Resync') == '1'
+            except (KeyError, TypeError, ValueError):
+                # truncated trailing line from a session that is still being written
+                continue
+            if first_runtime is None:
+                first_runtime = runtime
+                summary.start_timestamp = timestamp
+                continue
+            last_runtime = runtime
+            if gap > 0:
+                summary.gap_count += 1
+                summary.gap_duration += gap
+            if resynced:
+                resync_time += time_delta
+                continue
+            summary.sample_count += 1
+            summary.total_steps += steps
+            if time_delta > 0 and steps / time_delta > summary.peak_rate:
+                summary.peak_rate = steps / time_delta
+                summary.peak_rate_timestamp = timestamp
+    if last_runtime is not None:
+        summary.duration = last_runtime - first_runtime - resync_time
+    return summary
+
+
+class WWRNGLogCorpusIndexer:
+    def __init__(self, log_dir: str = 'logs/', index_file_path: str = None, max_workers: int = None):
+        self._log_dir = log_dir
+        if index_file_path is None:
+            index_file_path = os.path.join(log_dir, DEFAULT_INDEX_FILE_NAME)
+        self._index_file_path = index_file_path
+        self._max_workers = max_workers
+        self._connection = None  # type: Optional[sqlite3.Connection]
+
+    def open(self):
+        if self._connection is not None:
+            return
+        self._connection = sqlite3.connect(self._index_file_path)
+        if self._connection.execute('PRAGMA user_version').fetchone()[0] != INDEX_SCHEMA_VERSION:
+            self._connection.execute('DROP TABLE IF EXISTS sessions')
+            self._connection.execute('PRAGMA user_version = {}'.format(INDEX_SCHEMA_VERSION))
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            'path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL, '
+            'start_timestamp REAL, sample_count INTEGER NOT NULL, duration REAL NOT NULL, '
+            'total_steps INTEGER NOT NULL, peak_rate REAL NOT NULL, peak_rate_timestamp REAL, '
+            'gap_count INTEGER NOT NULL, gap_duration REAL NOT NULL)'
+        )
+        self._connection.commit()
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _find_stale_log_files(self) -> Tuple[List[str], List[str]]:
+        # the index may be shared between log directories, only consider records from this one
+        log_dir = os.path.abspath(self._log_dir)
+        indexed = {
+            path: (mtime, size)
+            for path, mtime, size in self._connection.execute('SELECT path, mtime, size FROM sessions')
+            if os.path.dirname(path) == log_dir
+        }  # type: Dict[str, Tuple[float, int]]
+        stale_paths = []
+        for path in sorted(glob.glob(os.path.join(log_dir, LOG_FILE_PATTERN))):
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                # deleted since the directory was listed, any index record is dropped below
+                continue
+            if indexed.pop(path, None) != (stat_result.st_mtime, stat_result.st_size):
+                stale_paths.append(path)
+        return stale_paths, list(indexed.keys())
+
+    def update(self) -> Tuple[int, int]:
+        """
+        Parse every new or modified log file in parallel and drop index records
+        for log files that no longer exist. Log files that cannot be read are
+        skipped with a warning and retried on the next update.
+
+        :return: the number of sessions (re)indexed and the number removed
+        :rtype: Tuple[int, int]
+        """
+        self.open()
+        stale_paths, removed_paths = self._find_stale_log_files()
+        summaries = []
+        if len(stale_paths) > 0:
+            with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = {executor.submit(parse_session_log, path): path for path in stale_paths}
+                for future in as_completed(futures):
+                    try:
+                        summaries.append(future.result())
+                    except (OSError, UnicodeDecodeError, csv.Error) as e:
+                        print('Skipping unreadable log {}: {}'.format(futures[future], e))
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO sessions ({}) VALUES ({})'.format(
+                    ', '.join(SessionSummary.FIELDS), ', '.join('?' * len(SessionSummary.FIELDS))
+                ),
+                [summary.as_row() for summary in summaries]
+            )
+            self._connection.executemany('DELETE FROM sessions WHERE path = ?', [(p, ) for p in removed_paths])
+        return len(summaries), len(removed_paths)
+
+    def get_sessions(self) -> List[SessionSummary]:
+        self.open()
+        cursor = self._connection.execute(
+            'SELECT {} FROM sessions ORDER BY start_timestamp'.format(', '.join(SessionSummary.FIELDS))
+        )
+        return [SessionSummary(*row) for row in cursor]
+
+    def get_corpus_totals(self) -> Tuple[int, float, int]:
+        """
+        :return: session count, total play time in seconds and total RNG steps across the corpus
+        :rtype: Tuple[int, float, int]
+        """
+        self.open()
+        return self._connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(duration), 0), COALESCE(SUM(total_steps), 0) FROM sessions'
+        ).fetchone()
+
+    def get_gap_totals(self) -> Tuple[int, float]:
+        """
+        :return: number of connection gaps and their total duration in seconds across the corpus
+        :rtype: Tuple[int, float]
+        """
+        self.open()
+        return self._connection.execute(
+            'SELECT COALESCE(SUM(gap_count), 0), COALESCE(SUM(gap_duration), 0) FROM sessions'
+        ).fetchone()
+
+    def get_average_calls_per_hour(self) -> float:
+        _, total_duration, total_steps = self.get_corpus_totals()
+        if total_duration <= 0:
+            return 0.0
+        return total_steps / total_duration * 3600
+
+    def get_worst_bursts(self, count: int = 10) -> List[SessionSummary]:
+        self.open()
+        cursor = self._connection.execute(
+            'SELECT {} FROM sessions ORDER BY peak_rate DESC LIMIT ?'.format(', '.join(SessionSummary.FIELDS)),
+            (count, )
+        )
+        return [SessionSummary(*row) for row in cursor]
+
+
+def _format_timestamp(timestamp: Optional[float]) -> str:
+    if timestamp is None:
+        return '-'
+    return datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def main(args: List[str]):
+    parser = argparse.ArgumentParser(description='Index WWRNG session logs and report cross-session statistics')
+    parser.add_argument('--log-dir', type=str, default='logs/')
+    parser.add_argument('--index', type=str, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--sessions', action='store_true', help='list every indexed session')
+    result = vars(parser.parse_args(args))
+    if not os.path.isdir(result['log_dir']):
+        print('Log directory {} does not exist'.format(result['log_dir']))
+        return 1
+    with WWRNGLogCorpusIndexer(result['log_dir'], result['index'], result['workers']) as indexer:
+        updated_count, removed_count = indexer.update()
+        session_count, total_duration, total_steps = indexer.get_corpus_totals()
+        print('indexed {} new/changed sessions, removed {}'.format(updated_count, removed_count))
+        print('sessions: {}, play time: {:.2f} h, total steps: {}'.format(
+            session_count, total_duration / 3600, total_steps
+        ))
+        print('average call rate: {:.0f} calls/hour'.format(indexer.get_average_calls_per_hour()))
+        print('connection gaps: {}, {:.1f} s total'.format(*indexer.get_gap_totals()))
+        if result['sessions']:
+            print('\nsessions:')
+            for summary in indexer.get_sessions():
+                print('  {}  {:8.1f} s  {:10d} steps  {:12.0f} calls/hour  {:3d} gaps  {}'.format(
+                    _format_timestamp(summary.start_timestamp), summary.duration, summary.total_steps,
+                    summary.calls_per_hour, summary.gap_count, os.path.basename(summary.path)
+                ))
+        print('\nworst bursts:')
+        for summary in indexer.get_worst_bursts(result['top']):
+            print('  {:10.1f} calls/sec at {}  {}'.format(
+                summary.peak_rate, _format_timestamp(summary.peak_rate_timestamp), os.path.basename(summary.path)
+            ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
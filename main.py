@@ -15,6 +15,7 @@ import os
 from threading import Thread
 
 from tcp_gecko_client import TCPGeckoClient
+from connection_supervisor import TCPGeckoConnectionSupervisor
 from ww_rng_tracker import WWRNGTracker
 from call_rate_plot_widget import CallRatePlotWidget
 from tcpgecko_log_client import TCPGeckoLoggingClient
@@ -27,10 +28,13 @@ class RNGCounterMainWindow(QMainWindow):
     _connection_complete_signal = pyqtSignal(bool, str)
     _disconnect_complete_signal = pyqtSignal()
     _new_data_signal = pyqtSignal(int, float, int)
+    _connection_status_signal = pyqtSignal(str)
+    _connection_gap_signal = pyqtSignal(float)
 
     def __init__(self, client: TCPGeckoClient, config_dict: Dict[str, str]):
         super().__init__(parent=None)
         self._client = client
+        self._supervisor = TCPGeckoConnectionSupervisor(client, status_listener=self.receive_connection_status)
         self._log_dir = config_dict['log_file_path']
         self._average_count = config_dict['average_count']
         self._tracker = None
@@ -74,6 +78,8 @@ class RNGCounterMainWindow(QMainWindow):
         self._connection_complete_signal.connect(self._handle_connection_complete)
         self._disconnect_complete_signal.connect(self._handle_disconnect_complete)
         self._new_data_signal.connect(self._handle_new_data)
+        self._connection_status_signal.connect(self._handle_connection_status)
+        self._connection_gap_signal.connect(self._handle_connection_gap)
 
     def closeEvent(self, event):
         if self._connection_thread is not None:
@@ -84,9 +90,27 @@ class RNGCounterMainWindow(QMainWindow):
     def receive_new_data(self, latest, average, total):
         self._new_data_signal.emit(latest, average, total)
 
+    def receive_connection_status(self, message: str):
+        self._connection_status_signal.emit(message)
+
+    def receive_connection_gap(self, gap: float):
+        self._connection_gap_signal.emit(gap)
+
+    def _handle_connection_status(self, message: str):
+        self._status_bar.showMessage(message)
+
+    def _handle_connection_gap(self, gap: float):
+        self._call_rate_plot.append_gap(gap)
+        self._status_bar.showMessage(
+            'Reconnected after {:.1f}s ({} outages, {:.1f}s total)'.format(
+                gap, self._supervisor.outage_count, self._supervisor.total_outage_time
+            ),
+            5000
+        )
+
     def _handle_new_data(self, latest, average, total):
         if latest < 0:
-            self._status_bar.showMessage('Got timeout from TCPGecko... May need to restart console/homebrew')
+            self._status_bar.showMessage('Got timeout from TCPGecko... Reconnecting')
             return
         self._latest_ticks_display.setText(str(latest))
         self._rolling_avg_ticks_display.setText(f'{average:.2f}')
@@ -117,7 +141,7 @@ class RNGCounterMainWindow(QMainWindow):
         except ValueError:
             self._connection_complete_signal.emit(False, 'Must enter a valid IP Address!')
             return
-        connect_success = self._client.connect(connect_ip)
+        connect_success = self._supervisor.connect(connect_ip)
         if not connect_success:
             self._connection_complete_signal.emit(False, 'Unable to connect to Wii U!')
             return
@@ -125,7 +149,9 @@ class RNGCounterMainWindow(QMainWindow):
             self._client, 
             log_file_path=self._log_dir, 
             new_data_listener=self.receive_new_data,
-            rolling_average_size=self._average_count
+            rolling_average_size=self._average_count,
+            supervisor=self._supervisor,
+            gap_listener=self.receive_connection_gap
         )
         self._tracker.start()
         self._connection_complete_signal.emit(True, 'Connected! (may take a moment to find current RNG state)')
@@ -135,7 +161,7 @@ class RNGCounterMainWindow(QMainWindow):
             self._tracker.stop()
             self._tracker = None
         self._connected = False
-        self._client.disconnect()
+        self._supervisor.disconnect()
         
         self._disconnect_complete_signal.emit()
 
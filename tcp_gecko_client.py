@@ -8,6 +8,10 @@ import time
 TCPGECKO_TCP_PORT = 7331
 TCPGECKO_PACKET_SIZE = 0x400
 TCPGECKO_BLOCK_ZERO_PREFIX = 0xB0.to_bytes(1, 'big')
+TCP_KEEPALIVE_IDLE_SECONDS = 1
+TCP_KEEPALIVE_INTERVAL_SECONDS = 1
+TCP_KEEPALIVE_PROBE_COUNT = 3
+TCP_USER_TIMEOUT_MILLISECONDS = 1000
 
 
 class TCPGeckoClient:
@@ -56,22 +60,87 @@ class TCPGeckoClient:
         PERSIST_ASSEMBLY = 0xE1
         CLEAR_ASSEMBLY = 0xE2
 
-    def __init__(self, read_timeout: int = 1.0):
+    # bounds for the adaptive read timeout, in seconds
+    MIN_READ_TIMEOUT = 0.25
+    # RFC 6298 smoothing factors for the round trip time estimate
+    RTT_ALPHA = 0.125
+    RTT_BETA = 0.25
+
+    def __init__(self, read_timeout: float = 1.0):
         self._read_timeout = read_timeout
         self._connection = None  # type: Optional[socket.socket]
+        self._smoothed_rtt = None  # type: Optional[float]
+        self._rtt_variance = 0.0
+        self._current_read_timeout = read_timeout
+
+    @property
+    def current_read_timeout(self) -> float:
+        """
+        :return: the read timeout derived from the measured round trip time, clamped
+            between MIN_READ_TIMEOUT and the configured read timeout
+        :rtype: float
+        """
+        return self._current_read_timeout
+
+    def _reset_rtt_estimate(self):
+        self._smoothed_rtt = None
+        self._rtt_variance = 0.0
+        self._current_read_timeout = self._read_timeout
+
+    def _update_rtt_estimate(self, rtt: float):
+        if self._smoothed_rtt is None:
+            self._smoothed_rtt = rtt
+            self._rtt_variance = rtt / 2
+        else:
+            self._rtt_variance = (1 - self.RTT_BETA) * self._rtt_variance + self.RTT_BETA * abs(self._smoothed_rtt - rtt)
+            self._smoothed_rtt = (1 - self.RTT_ALPHA) * self._smoothed_rtt + self.RTT_ALPHA * rtt
+        timeout = self._smoothed_rtt + 4 * self._rtt_variance
+        self._current_read_timeout = min(max(timeout, self.MIN_READ_TIMEOUT), self._read_timeout)
+        self._connection.settimeout(self._current_read_timeout)
+
+    def _back_off_read_timeout(self) -> bool:
+        # RFC 6298 5.5, double the timeout on expiry so a slower console is not mistaken for a dead link
+        if self._current_read_timeout >= self._read_timeout:
+            return False
+        self._current_read_timeout = min(self._current_read_timeout * 2, self._read_timeout)
+        self._connection.settimeout(self._current_read_timeout)
+        return True
+
+    @staticmethod
+    def _enable_keepalive(connection_socket: socket.socket):
+        connection_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'SIO_KEEPALIVE_VALS'):
+            # windows takes idle time and probe interval in milliseconds
+            connection_socket.ioctl(
+                socket.SIO_KEEPALIVE_VALS,
+                (1, TCP_KEEPALIVE_IDLE_SECONDS * 1000, TCP_KEEPALIVE_INTERVAL_SECONDS * 1000)
+            )
+            return
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            connection_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE_SECONDS)
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            connection_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, TCP_KEEPALIVE_INTERVAL_SECONDS)
+        if hasattr(socket, 'TCP_KEEPCNT'):
+            connection_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, TCP_KEEPALIVE_PROBE_COUNT)
+        if hasattr(socket, 'TCP_USER_TIMEOUT'):
+            # fail writes that go unacknowledged instead of retransmitting for minutes
+            connection_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, TCP_USER_TIMEOUT_MILLISECONDS)
 
     def connect(self, ip_address: str) -> bool:
         if self._connection is not None:
             raise RuntimeError('Client already connected!')
+        self._reset_rtt_estimate()
         try:
             connection_socket = socket.create_connection((ip_address, TCPGECKO_TCP_PORT), timeout=1.0)
-        except socket.timeout:
+        except OSError:
             return False
         if connection_socket is None:
             return False
-        connection_socket.settimeout(self._read_timeout)
-        if connection_socket is None:
-            return False
+        try:
+            self._enable_keepalive(connection_socket)
+        except OSError:
+            pass
+        connection_socket.settimeout(self.current_read_timeout)
         self._connection = connection_socket
         time.sleep(0.100)
         return True
@@ -80,6 +149,7 @@ class TCPGeckoClient:
         if self._connection is not None:
             self._connection.close()
             self._connection = None
+        self._reset_rtt_estimate()
 
     def get_server_version_hash(self):
         self._connection.send(self.Commands.GET_VERSION_HASH.to_bytes(1, 'big'))
@@ -97,32 +167,48 @@ class TCPGeckoClient:
         to_send = struct.pack(
             '>LL', start_address, end_address
         )
+        if self._connection is None:
+            return None
+        request_time = time.perf_counter()
         try:
             sent_bytes = self._connection.send(self.Commands.READ_MEMORY.to_bytes(1, byteorder='big'))
-        except (ConnectionResetError, ConnectionRefusedError):
+        except OSError:
             return None
         if sent_bytes != 1:
             return None
         try:
             sent_bytes = self._connection.send(to_send)
-        except (ConnectionResetError, ConnectionRefusedError):
+        except OSError:
             return None
         if sent_bytes != len(to_send):
             return None
         read_memory_values = bytearray()
+        retried = False
 
-        def read_chunk(chunk_length: int):
+        def recv_with_retry(size: int):
+            nonlocal retried
             try:
-                prefix_byte = self._connection.recv(1)
+                return self._connection.recv(size)
             except socket.timeout:
+                # wait once more for the same reply with a doubled timeout, this also
+                # consumes a late reply instead of leaving it to be read by the next request
+                if retried or not self._back_off_read_timeout():
+                    raise
+                retried = True
+                return self._connection.recv(size)
+
+        def read_chunk(chunk_length: int):
+            try:
+                prefix_byte = recv_with_retry(1)
+                if len(prefix_byte) == 0:
+                    # peer closed the connection
+                    return None
+                if prefix_byte == TCPGECKO_BLOCK_ZERO_PREFIX:
+                    return b'\x00' * chunk_length
+                return recv_with_retry(data_size_bytes)
+            except OSError:
+                # covers socket.timeout as well as resets and broken pipes
                 return None
-            except ConnectionResetError:
-                return None
-            if prefix_byte == TCPGECKO_BLOCK_ZERO_PREFIX:
-                return b'\x00' * chunk_length
-            else:
-                return self._connection.recv(data_size_bytes)
-            return None
 
         for idx in range(chunk_count + 1):
             packet_size = final_chunk_size if idx == chunk_count else TCPGECKO_PACKET_SIZE
@@ -130,6 +216,6 @@ class TCPGeckoClient:
             if data is None:
                 return None
             read_memory_values.extend(data)
-        
+        self._update_rtt_estimate(time.perf_counter() - request_time)
         return read_memory_values
     
\ No newline at end of file
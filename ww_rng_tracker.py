@@ -2,6 +2,7 @@
 from typing import Callable
 from enum import IntEnum
 from tcp_gecko_client import TCPGeckoClient
+from connection_supervisor import TCPGeckoConnectionSupervisor
 from threading import Thread
 from collections import deque
 import datetime
@@ -13,14 +14,23 @@ import csv
 
 class WWRNGTracker:
     RNG_STATE_BASE_ADDR_PAL = 0x10701BD4
+    RNG_SEED_STATE = (100, 100, 100)
     TCP_REQUEST_DELAY = 0.050
+    # the search after an outage may cover RESYNC_MARGIN times the steps the observed
+    # peak rate (at least RESYNC_MIN_RATE calls/sec) allows over the gap
+    RESYNC_MIN_RATE = 1000.0
+    RESYNC_MARGIN = 2.0
 
     def __init__(self, 
                  client: TCPGeckoClient, 
                  log_file_path: str = 'logs/', 
                  new_data_listener: Callable[[int, float, int], None] = None,
-                 rolling_average_size: int = 4):
+                 rolling_average_size: int = 4,
+                 supervisor: TCPGeckoConnectionSupervisor = None,
+                 gap_listener: Callable[[float], None] = None):
         self._client = client
+        self._supervisor = supervisor
+        self._gap_listener = gap_listener
         self._log_file_path = log_file_path
         self._rolling_average_size = rolling_average_size
         self._log_file_handle = None
@@ -35,46 +45,96 @@ class WWRNGTracker:
         state[2] = (state[2] * 170) % 30323
         return (state[0] / 30269.0 + state[1] / 30307.0 + state[2] / 30323.0) % 1.0
 
-    def _forward_search_rng_state(self, search_state, start_state):
+    def _forward_search_rng_state(self, search_state, start_state, max_steps: int = None):
         count = 0
         while search_state != start_state and self._running:
+            if max_steps is not None and count >= max_steps:
+                return None
             WWRNGTracker._wichmann_hill_step(start_state)
             count += 1
         return count
 
     def _collect_rng_data_callback(self):
-        last_rng_state = [100, 100, 100]
+        last_rng_state = list(self.RNG_SEED_STATE)
+        # number of steps from the seed state to last_rng_state
+        last_seed_index = 0
         prev_read_time = 0
         total_ticks = 0
+        peak_rate = 0.0
+        first_sample = True
+        outage_start_time = None
         time_deltas = deque(maxlen=self._rolling_average_size)
         rng_reading_steps = deque(maxlen=self._rolling_average_size)
         if self._log_file_handle is not None:
             log_file_writer = csv.writer(self._log_file_handle)
-            log_file_writer.writerow(['Timestamp', 'Runtime', 'Time Delta', 'Steps', 'Avg Steps', 'Total Steps'])
+            log_file_writer.writerow(['Timestamp', 'Runtime', 'Time Delta', 'Steps', 'Avg Steps', 'Total Steps', 'Gap', 'Resync'])
         else:
             log_file_writer = None
         while self._running:
-            new_read_time = time.perf_counter()
-            time_delta = new_read_time - prev_read_time
-            prev_read_time = new_read_time
             raw_rng_state_data = self._client.read_memory_range(
                 self.RNG_STATE_BASE_ADDR_PAL, 
                 self.RNG_STATE_BASE_ADDR_PAL + 12
             )
-            if raw_rng_state_data is None:
-                self._data_listener(-1, -1, -1)
-                time.sleep(0.1)
+            if raw_rng_state_data is None or len(raw_rng_state_data) != 12:
+                if outage_start_time is None:
+                    outage_start_time = time.perf_counter()
+                    if self._data_listener is not None:
+                        self._data_listener(-1, -1, -1)
+                if self._supervisor is not None:
+                    # a timed out request may still be answered later, so never reuse the socket
+                    self._supervisor.reconnect(lambda: self._running)
+                else:
+                    time.sleep(0.1)
                 continue
+            # time delta spans any outage so steps accumulated meanwhile are not reported as a burst
+            new_read_time = time.perf_counter()
+            time_delta = new_read_time - prev_read_time
+            prev_read_time = new_read_time
+            gap = 0.0
+            max_steps = None
+            if outage_start_time is not None:
+                gap = new_read_time - outage_start_time
+                outage_start_time = None
+                if self._supervisor is not None:
+                    self._supervisor.record_outage(gap)
+                if self._gap_listener is not None:
+                    self._gap_listener(gap)
+                max_steps = int(max(peak_rate, self.RESYNC_MIN_RATE) * time_delta * self.RESYNC_MARGIN)
+            # resync continues the forward search from the last known state of this session
             read_rng_state = list(struct.unpack('>III', raw_rng_state_data))
-            steps_taken = self._forward_search_rng_state(read_rng_state, last_rng_state)
-            total_ticks += steps_taken
-            time_deltas.append(time_delta)
-            rng_reading_steps.append(steps_taken)
+            steps_taken = self._forward_search_rng_state(read_rng_state, list(last_rng_state), max_steps)
+            resynced = False
+            if steps_taken is None:
+                # not within the bound, locate the state relative to the seed instead
+                seed_index = self._forward_search_rng_state(read_rng_state, list(self.RNG_SEED_STATE))
+                if seed_index >= last_seed_index:
+                    # the bound was too tight, the state is still ahead of the last one
+                    steps_taken = seed_index - last_seed_index
+                else:
+                    # the state moved backwards, the console or game was restarted,
+                    # so count from the seed like the first sample of a session
+                    steps_taken = seed_index
+                    resynced = True
+            if not self._running:
+                # a search was interrupted by stop(), its step count is meaningless
+                break
             last_rng_state = read_rng_state
-            last_second_avg = sum(rng_reading_steps) / sum(time_deltas)
+            last_seed_index = steps_taken if resynced else last_seed_index + steps_taken
+            if resynced:
+                total_ticks += steps_taken
+                time_deltas.clear()
+                rng_reading_steps.clear()
+            else:
+                total_ticks += steps_taken
+                time_deltas.append(time_delta)
+                rng_reading_steps.append(steps_taken)
+                if not first_sample and time_delta > 0:
+                    peak_rate = max(peak_rate, steps_taken / time_delta)
+            first_sample = False
+            last_second_avg = sum(rng_reading_steps) / sum(time_deltas) if len(time_deltas) > 0 else 0.0
             if self._log_file_handle is not None:
                 log_file_writer.writerow(
-                    [datetime.datetime.now().timestamp(), time.perf_counter(), time_delta, steps_taken, last_second_avg, total_ticks]
+                    [datetime.datetime.now().timestamp(), time.perf_counter(), time_delta, steps_taken, last_second_avg, total_ticks, gap, int(resynced)]
                 )
             if self._data_listener is not None:
                 self._data_listener(steps_taken, last_second_avg, total_ticks)